@@ -1,20 +1,89 @@
-from fastapi import FastAPI
+import hashlib
+import math
+import os
+import re
+from functools import lru_cache
+
+import msgspec
+import numpy as np
+import orjson
+from numba import config as numba_config, njit, prange
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Annotated, List
 
-app = FastAPI()
 
+# The parallel batch kernel releases the GIL and can run in several threadpool
+# workers at once, so it needs a threading layer that tolerates concurrent
+# parallel launches (TBB or OpenMP, not the default workqueue); without
+# either, it falls back to a serial build (see below)
+numba_config.THREADING_LAYER = "threadsafe"
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+class OrjsonResponse(JSONResponse):
+    """JSON response rendered straight to bytes by orjson.
+
+    NumPy arrays are serialized directly from their buffers, so yearly series
+    can be returned without converting them to Python lists first.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+
+class BatchGZipMiddleware(GZipMiddleware):
+    """Gzip only the batch stream.
+
+    Single-scenario responses are a few KB and latency-bound; compressing them
+    would cost about as much as rendering a cached result.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"] == "/calculate-model/batch":
+            await super().__call__(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
+app = FastAPI(default_response_class=OrjsonResponse)
+
+# Batch sweeps stream long runs of repetitive float text; level 1 keeps the
+# CPU cost negligible while still shrinking them several-fold
+app.add_middleware(BatchGZipMiddleware, minimum_size=1024, compresslevel=1)
+
+# Set CORS_ALLOW_ORIGINS to a comma-separated list of dashboard origins in
+# production; preflight results are cached by the browser for a day. The
+# dashboard is cross-origin, so it must be allowed to send If-None-Match and
+# read the ETag for conditional requests to work. The API uses no cookies or
+# auth, so credentialed requests are not allowed (with "*", Starlette would
+# otherwise echo back any Origin).
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=[
+        origin.strip() for origin in os.environ.get("CORS_ALLOW_ORIGINS", "*").split(",")
+    ],
+    allow_credentials=False,
+    allow_methods=["GET", "POST"],
+    allow_headers=["content-type", "if-none-match"],
+    expose_headers=["ETag"],
+    max_age=86400,
 )
 
 
-class ProjectInputs(BaseModel):
+# Upper bound on the project life; every cached result holds one row per year,
+# so this also bounds the memory the result cache can pin
+MAX_PROJECT_DURATION_YEARS = 100
+
+
+# Decoded straight from the request body by msgspec (see run_financial_model);
+# frozen so decoded inputs are hashable and can key the result cache
+class ProjectInputs(msgspec.Struct, frozen=True, kw_only=True, forbid_unknown_fields=True):
     hard_costs: float
     soft_costs: float
     capacity_solar_mw: float = 0.0
@@ -26,143 +95,464 @@ class ProjectInputs(BaseModel):
     tax_rate: float
     interest_rate: float
     debt_share: float  # 0.0 to 1.0
-    project_duration_years: int
+    project_duration_years: Annotated[int, msgspec.Meta(ge=0, le=MAX_PROJECT_DURATION_YEARS)]
+
+
+class BatchInputs(BaseModel):
+    # One value per scenario; single-element lists are broadcast to all scenarios
+    hard_costs: List[float]
+    soft_costs: List[float]
+    capacity_solar_mw: List[float] = [0.0]
+    capacity_hydro_mw: List[float] = [0.0]
+    capacity_diesel_mw: List[float] = [0.0]
+    tariff_php_per_kwh: List[float]
+    annual_opex: List[float]
+    tax_rate: List[float]
+    interest_rate: List[float]
+    debt_share: List[float]
+    project_duration_years: List[Annotated[int, Field(ge=0, le=MAX_PROJECT_DURATION_YEARS)]]
+
+
+# Constants (physics & financial assumptions)
+SOLAR_YIELD = 1450  # kWh/kWp/year (~16.5% CF)
+HYDRO_CF = 0.60     # Hydro: 60% CF → 8760 * 0.60 kWh/kW/year
+DIESEL_CF = 0.15    # Diesel: 15% CF → 8760 * 0.15 kWh/kW/year
+DEGRADATION_RATE = 0.005  # 0.5% per year
+INFLATION_RATE = 0.03     # 3% per year
+
+# Part of every ETag; bump whenever a change to the model alters its results
+MODEL_VERSION = b"1"
+
+# Degradation and inflation rates are fixed, so their escalation factors are
+# tabulated once at import for the longest accepted project life (frozen into
+# the kernel)
+_FACTOR_TABLE_YEARS = MAX_PROJECT_DURATION_YEARS
+_DEGRADATION_FACTORS = (1 - DEGRADATION_RATE) ** np.arange(_FACTOR_TABLE_YEARS)
+_INFLATION_FACTORS = (1 + INFLATION_RATE) ** np.arange(_FACTOR_TABLE_YEARS)
+
+
+def _yr1_production_mwh(capacity_solar_mw, capacity_hydro_mw, capacity_diesel_mw):
+    """Year 1 production per technology in MWh (scalars or NumPy arrays)."""
+    solar_gen = capacity_solar_mw * SOLAR_YIELD  # MWh/year (MW * 1450)
+    hydro_gen = capacity_hydro_mw * 8760 * HYDRO_CF  # kWh/year
+    diesel_gen = capacity_diesel_mw * 8760 * DIESEL_CF  # kWh/year
 
+    # Convert hydro & diesel kWh to MWh
+    return solar_gen, hydro_gen / 1000.0, diesel_gen / 1000.0
+
+
+@njit(cache=True)
+def _annual_debt_service(total_debt, interest_rate, years):
+    """Level annual payment that amortizes total_debt over the project life."""
+    if years <= 0:
+        return 0.0
+    if interest_rate > 0:
+        # factor - 1 via expm1/log1p stays accurate for very small rates
+        factor_minus_1 = math.expm1(years * math.log1p(interest_rate))
+        return total_debt * interest_rate * (factor_minus_1 + 1) / factor_minus_1
+    return total_debt / years
+
+
+# Every fast-math flag except "contract": fusing the interest and principal
+# arithmetic into FMAs shifts the carried debt balance by an ulp a year, which
+# long high-rate loans amplify into visible drift
+_FASTMATH_FLAGS = {"nnan", "ninf", "nsz", "arcp", "afn", "reassoc"}
+
+
+@njit(inline="always", fastmath=_FASTMATH_FLAGS)
+def _project_year(
+    degradation_factor,
+    inflation_factor,
+    remaining_debt,
+    yr1_production_mwh,
+    tariff_php_per_kwh,
+    annual_opex,
+    tax_rate,
+    interest_rate,
+    annual_debt_service,
+):
+    """One project year given its escalation factors and opening debt balance
+    (shared by the kernels)."""
+    # Degradation on production
+    current_production_mwh = yr1_production_mwh * degradation_factor
+
+    # Revenue and Opex with inflation
+    current_revenue = current_production_mwh * 1000 * tariff_php_per_kwh
+    current_opex = annual_opex * inflation_factor
+
+    # Debt amortization
+    if remaining_debt > 0 and annual_debt_service > 0:
+        interest_payment = remaining_debt * interest_rate
+        # Protect against negative principal in very late years
+        principal_payment = min(max(annual_debt_service - interest_payment, 0.0), remaining_debt)
+    else:
+        interest_payment = 0.0
+        principal_payment = 0.0
 
-@app.post("/calculate-model")
-def run_financial_model(inputs: ProjectInputs):
-    # Constants (physics & financial assumptions)
-    solar_yield = 1450  # kWh/kWp/year (~16.5% CF)
-    hydro_cf = 0.60     # Hydro: 60% CF → 8760 * 0.60 kWh/kW/year
-    diesel_cf = 0.15    # Diesel: 15% CF → 8760 * 0.15 kWh/kW/year
-    degradation_rate = 0.005  # 0.5% per year
-    inflation_rate = 0.03     # 3% per year
+    # CFADS and DSCR
+    cfads = current_revenue - current_opex  # Cash Flow Available for Debt Service
+    if annual_debt_service > 0:
+        dscr = cfads / annual_debt_service
+    else:
+        dscr = 0.0
+
+    # Tax & profit (simple cash tax, no depreciation)
+    taxable_income = cfads - interest_payment
+    net_profit = taxable_income - max(taxable_income, 0.0) * tax_rate
+
+    # Free cash after debt service and tax (feeds the running cash)
+    free_cash_after_debt = net_profit - principal_payment
+
+    return (
+        current_production_mwh,
+        current_revenue,
+        current_opex,
+        interest_payment,
+        principal_payment,
+        net_profit,
+        dscr,
+        free_cash_after_debt,
+    )
 
-    # Year 1 production (MWh)
-    solar_gen = inputs.capacity_solar_mw * 1450  # MWh/year (MW * 1450)
-    hydro_gen = inputs.capacity_hydro_mw * 8760 * hydro_cf  # kWh/year
-    diesel_gen = inputs.capacity_diesel_mw * 8760 * diesel_cf  # kWh/year
 
-    # Convert hydro & diesel kWh to MWh
-    yr1_production_solar = solar_gen  # MWh/year
-    yr1_production_hydro = hydro_gen / 1000.0
-    yr1_production_diesel = diesel_gen / 1000.0
+@njit(cache=True, fastmath=_FASTMATH_FLAGS, nogil=True)
+def _project(
+    years,
+    yr1_production_mwh,
+    tariff_php_per_kwh,
+    annual_opex,
+    tax_rate,
+    total_capex,
+    total_debt,
+    interest_rate,
+    annual_debt_service,
+):
+    """Compiled yearly projection; returns one pre-sized array per series
+    followed by the project payback year (999 if never reached).
+
+    years must not exceed _FACTOR_TABLE_YEARS, which input validation enforces.
+    """
+    n = max(years, 0)
+    gen_mwh = np.empty(n)
+    revenue = np.empty(n)
+    opex = np.empty(n)
+    debt_service = np.empty(n)
+    principal = np.empty(n)
+    interest = np.empty(n)
+    net_profit = np.empty(n)
+    dscr = np.empty(n)
+    cumulative_cash = np.empty(n)
+
+    # One serial pass: the debt balance and running cash carry from year to
+    # year, and at most a hundred years is too little work to parallelize
+    remaining_debt = total_debt
+    running_cash = -total_capex  # project-level payback
+    project_payback_year = 999
+    for i in range(n):
+        (
+            gen_mwh[i],
+            revenue[i],
+            opex[i],
+            interest[i],
+            principal[i],
+            net_profit[i],
+            dscr[i],
+            free_cash_after_debt,
+        ) = _project_year(
+            _DEGRADATION_FACTORS[i],
+            _INFLATION_FACTORS[i],
+            remaining_debt,
+            yr1_production_mwh,
+            tariff_php_per_kwh,
+            annual_opex,
+            tax_rate,
+            interest_rate,
+            annual_debt_service,
+        )
+        debt_service[i] = interest[i] + principal[i]
+        # The balance is carried forward exactly as repaid (a closed form would
+        # cancel catastrophically for long high-rate loans)
+        remaining_debt = max(remaining_debt - principal[i], 0.0)
 
-    total_yr1_production_mwh = (
-        yr1_production_solar + yr1_production_hydro + yr1_production_diesel
+        # Running cash (equity-like payback after debt service and tax)
+        running_cash += free_cash_after_debt
+        cumulative_cash[i] = running_cash
+        if running_cash > 0 and project_payback_year == 999:
+            project_payback_year = i + 1
+
+    return (
+        gen_mwh,
+        revenue,
+        opex,
+        debt_service,
+        principal,
+        interest,
+        net_profit,
+        dscr,
+        cumulative_cash,
+        project_payback_year,
     )
 
-    # Total CAPEX, equity, and debt
-    total_capex = inputs.hard_costs + inputs.soft_costs
-    total_equity = total_capex * (1 - inputs.debt_share)
-    total_debt = total_capex * inputs.debt_share
 
-    # Debt amortization (mortgage-style)
-    r = inputs.interest_rate
-    n = inputs.project_duration_years
-    if n <= 0:
-        annual_debt_service = 0.0
+@njit(cache=True, parallel=True, nogil=True)
+def _project_batch(
+    years,
+    yr1_production_mwh,
+    tariff_php_per_kwh,
+    annual_opex,
+    tax_rate,
+    total_capex,
+    total_debt,
+    interest_rate,
+):
+    """Summary metrics per scenario, computed in parallel across the batch."""
+    k = years.shape[0]
+    annual_revenue = np.zeros(k)
+    annual_net_profit = np.zeros(k)
+    lcoe = np.empty(k)
+    avg_dscr = np.empty(k)
+    project_payback_year = np.full(k, 999, dtype=np.int64)
+
+    for j in prange(k):
+        annual_debt_service = _annual_debt_service(total_debt[j], interest_rate[j], years[j])
+
+        lifetime_production_mwh = 0.0
+        lifetime_opex = 0.0
+        dscr_sum = 0.0
+        dscr_count = 0
+        running_cash = -total_capex[j]
+        remaining_debt = total_debt[j]
+
+        d = 1.0
+        f = 1.0
+        for i in range(max(years[j], 0)):
+            (
+                current_production_mwh,
+                current_revenue,
+                current_opex,
+                _,
+                principal_payment,
+                net_profit,
+                dscr,
+                free_cash_after_debt,
+            ) = _project_year(
+                d,
+                f,
+                remaining_debt,
+                yr1_production_mwh[j],
+                tariff_php_per_kwh[j],
+                annual_opex[j],
+                tax_rate[j],
+                interest_rate[j],
+                annual_debt_service,
+            )
+            if i == 0:
+                annual_revenue[j] = current_revenue
+                annual_net_profit[j] = net_profit
+            lifetime_production_mwh += current_production_mwh
+            lifetime_opex += current_opex
+            dscr_sum += max(dscr, 0.0)
+            dscr_count += dscr > 0
+            running_cash += free_cash_after_debt
+            if running_cash > 0 and project_payback_year[j] == 999:
+                project_payback_year[j] = i + 1
+
+            d *= 1 - DEGRADATION_RATE
+            f *= 1 + INFLATION_RATE
+            remaining_debt = max(remaining_debt - principal_payment, 0.0)
+
+        # Masked divisions: 0.0 when there is no production / no covered year
+        has_production = lifetime_production_mwh > 0
+        lifetime_cost = total_capex[j] + lifetime_opex
+        lcoe[j] = (has_production * lifetime_cost) / max(lifetime_production_mwh, 1e-300)
+        avg_dscr[j] = dscr_sum / max(dscr_count, 1)
+
+    return annual_revenue, annual_net_profit, lcoe, avg_dscr, project_payback_year
+
+
+def _warm_up_kernels():
+    """Compile (or load from cache) so the first request is not penalized."""
+    _project(1, 1.0, 1.0, 1.0, 0.0, 1.0, 1.0, 0.1, 1.0)
+    _project_batch(np.ones(1, dtype=np.int64), *np.ones((7, 1)))
+
+
+try:
+    _warm_up_kernels()
+except ValueError as exc:
+    if not str(exc).startswith("No threading layer could be loaded"):
+        raise
+    # Neither TBB nor OpenMP could be loaded (e.g. a plain pip install on
+    # macOS has no libomp), so the parallel batch kernel cannot launch. Fall
+    # back to a serial build: prange runs as a plain range, and nogil still
+    # lets concurrent requests overlap.
+    _project_batch = njit(nogil=True)(_project_batch.py_func)
+    _warm_up_kernels()
+
+
+# msgspec messages mapped onto the pydantic error types FastAPI reports
+_MSGSPEC_FIELD_ERRORS = (
+    (re.compile(r"Object missing required field `(\w+)`"), "missing", "Field required"),
+    (
+        re.compile(r"Object contains unknown field `(\w+)`"),
+        "extra_forbidden",
+        "Extra inputs are not permitted",
+    ),
+)
+_MSGSPEC_ERROR_PATH = re.compile(r" - at `\$\.(\w+)`$")
+
+
+def _request_validation_error(exc):
+    """FastAPI-style 422 for a msgspec decode error, so clients get the same
+    {"detail": [{"type", "loc", "msg", "input"}]} body as on pydantic routes."""
+    message = str(exc)
+    error_type = "value_error" if isinstance(exc, msgspec.ValidationError) else "json_invalid"
+    loc = ("body",)
+    for pattern, field_error_type, field_message in _MSGSPEC_FIELD_ERRORS:
+        match = pattern.match(message)
+        if match:
+            error_type, loc, message = field_error_type, ("body", match[1]), field_message
+            break
     else:
-        if r > 0:
-            factor = (1 + r) ** n
-            annual_debt_service = total_debt * (r * factor) / (factor - 1) if factor != 1 else 0.0
-        else:
-            annual_debt_service = total_debt / n
+        match = _MSGSPEC_ERROR_PATH.search(message)
+        if match:
+            loc, message = ("body", match[1]), message[: match.start()]
+    return RequestValidationError([{"type": error_type, "loc": loc, "msg": message, "input": None}])
+
+
+def _etag_matches(if_none_match, etag):
+    """Weak comparison of an If-None-Match header with etag (RFC 9110 13.1.2)."""
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(",")
+    )
 
-    remaining_debt = total_debt
 
-    # Aggregations for LCOE and payback
-    lifetime_production_mwh = 0.0
-    lifetime_opex = 0.0
+# Lax mode coerces the way pydantic did (25.0 -> 25, "5.25" -> 5.25)
+_decode_project_inputs = msgspec.json.Decoder(ProjectInputs, strict=False)
+_, _schema_components = msgspec.json.schema_components([ProjectInputs])
 
-    # Waterfall / cash flow tracking
-    running_cash = -total_capex  # project-level payback
-    project_payback_year = 999
 
-    # DSCR tracking
-    dscr_list = []
+@app.post(
+    "/calculate-model",
+    response_model=None,
+    response_class=OrjsonResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": _schema_components["ProjectInputs"]}
+            },
+        }
+    },
+)
+async def run_financial_model(request: Request):
+    # The body is decoded and type-checked by msgspec in one pass, skipping
+    # FastAPI's pydantic validation for this hot endpoint; errors keep
+    # FastAPI's 422 shape
+    try:
+        inputs = _decode_project_inputs.decode(await request.body())
+    except msgspec.DecodeError as exc:
+        raise _request_validation_error(exc)
+
+    # A single scenario is a cache lookup or a few microseconds in the compiled
+    # kernel, so it runs on the event loop instead of the threadpool.
+    # Identical scenarios (slider undo/redo, re-sent payloads) are served from
+    # the in-process cache; let the browser reuse them briefly as well, and
+    # answer conditional requests for an unchanged scenario with a 304.
+    # The tag digests the canonical input encoding plus the model version, so
+    # it is identical across workers and changes whenever the results would.
+    # Note: RFC 9110 prescribes 412 for a matching If-None-Match on POST; this
+    # endpoint is a pure calculation, so it deliberately answers 304 instead.
+    digest = hashlib.blake2b(
+        msgspec.json.encode(inputs) + MODEL_VERSION, digest_size=16
+    ).hexdigest()
+    etag = f'W/"{digest}"'
+    headers = {"Cache-Control": "private, max-age=60", "ETag": etag}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    # The result holds NumPy arrays, so it is rendered by orjson directly
+    # rather than going through FastAPI's jsonable_encoder.
+    return OrjsonResponse(_run_cached(inputs), headers=headers)
+
+
+@lru_cache(maxsize=2048)
+def _run_cached(inputs: ProjectInputs):
+    # Bind inputs to locals once instead of repeated attribute lookups
+    hard_costs = inputs.hard_costs
+    soft_costs = inputs.soft_costs
+    capacity_solar_mw = inputs.capacity_solar_mw
+    capacity_hydro_mw = inputs.capacity_hydro_mw
+    capacity_diesel_mw = inputs.capacity_diesel_mw
+    capacity_bess_mwh = inputs.capacity_bess_mwh
+    tariff_php_per_kwh = inputs.tariff_php_per_kwh
+    annual_opex = inputs.annual_opex
+    tax_rate = inputs.tax_rate
+    interest_rate = inputs.interest_rate
+    debt_share = inputs.debt_share
+    project_duration_years = inputs.project_duration_years
+
+    # Year 1 production (MWh)
+    yr1_production_solar, yr1_production_hydro, yr1_production_diesel = _yr1_production_mwh(
+        capacity_solar_mw, capacity_hydro_mw, capacity_diesel_mw
+    )
+    total_yr1_production_mwh = (
+        yr1_production_solar + yr1_production_hydro + yr1_production_diesel
+    )
+
+    # Total CAPEX, equity, and debt
+    total_capex = hard_costs + soft_costs
+    total_debt = total_capex * debt_share
+    total_equity = total_capex - total_debt
+
+    # Debt amortization (mortgage-style)
+    r = interest_rate
+    n = project_duration_years
+    annual_debt_service = _annual_debt_service(total_debt, r, n)
+
+    # Yearly projection (compiled kernel)
+    (
+        gen_mwh,
+        revenue,
+        opex,
+        debt_service,
+        principal,
+        interest,
+        net_profit,
+        dscr,
+        cumulative_cash,
+        project_payback_year,
+    ) = _project(
+        n,
+        total_yr1_production_mwh,
+        tariff_php_per_kwh,
+        annual_opex,
+        tax_rate,
+        total_capex,
+        total_debt,
+        r,
+        annual_debt_service,
+    )
+    years = np.arange(1, n + 1)
+
+    # Aggregations for LCOE
+    lifetime_production_mwh = float(gen_mwh.sum())
+    lifetime_opex = float(opex.sum())
 
     # Year 1 summary metrics for charting
-    annual_revenue_year1 = 0.0
-    annual_net_profit_year1 = 0.0
-
-    # Yearly breakdown lists
-    years = []
-    gen_mwh_list = []
-    revenue_list = []
-    opex_list = []
-    debt_service_list = []
-    principal_list = []
-    interest_list = []
-    net_profit_list = []
-    dscr_year_list = []
-    cumulative_cash_list = []
-
-    for year in range(1, inputs.project_duration_years + 1):
-        # Degradation on production
-        degradation_factor = (1 - degradation_rate) ** (year - 1)
-        current_production_mwh = total_yr1_production_mwh * degradation_factor
-        current_production_kwh = current_production_mwh * 1000
-
-        # Revenue and Opex with inflation
-        current_revenue = current_production_kwh * inputs.tariff_php_per_kwh
-        current_opex = inputs.annual_opex * ((1 + inflation_rate) ** (year - 1))
-
-        # Debt amortization
-        if remaining_debt > 0 and annual_debt_service > 0:
-            interest_payment = remaining_debt * r
-            # Protect against negative principal in very late years
-            principal_payment = max(annual_debt_service - interest_payment, 0.0)
-            if principal_payment > remaining_debt:
-                principal_payment = remaining_debt
-            debt_service = interest_payment + principal_payment
-            remaining_debt = max(remaining_debt - principal_payment, 0.0)
-        else:
-            interest_payment = 0.0
-            principal_payment = 0.0
-            debt_service = 0.0
-
-        # Tax & profit (simple cash tax, no depreciation)
-        taxable_income = current_revenue - current_opex - interest_payment
-        tax = taxable_income * inputs.tax_rate if taxable_income > 0 else 0.0
-        net_profit = taxable_income - tax
-
-        # CFADS and DSCR
-        cfads = current_revenue - current_opex  # Cash Flow Available for Debt Service
-        if annual_debt_service > 0:
-            dscr = cfads / annual_debt_service
-        else:
-            dscr = 0.0
+    if n > 0:
+        annual_revenue_year1 = float(revenue[0])
+        annual_net_profit_year1 = float(net_profit[0])
+    else:
+        annual_revenue_year1 = 0.0
+        annual_net_profit_year1 = 0.0
 
-        # Running cash (equity-like payback after debt service and tax)
-        free_cash_after_debt = current_revenue - current_opex - tax - debt_service
-        running_cash += free_cash_after_debt
-        if running_cash > 0 and project_payback_year == 999:
-            project_payback_year = year
-
-        # Aggregations for LCOE
-        lifetime_production_mwh += current_production_mwh
-        lifetime_opex += current_opex
-
-        # Capture year 1 metrics for summary
-        if year == 1:
-            annual_revenue_year1 = current_revenue
-            annual_net_profit_year1 = net_profit
-
-        # Store yearly breakdown
-        years.append(year)
-        gen_mwh_list.append(current_production_mwh)
-        revenue_list.append(current_revenue)
-        opex_list.append(current_opex)
-        debt_service_list.append(debt_service)
-        principal_list.append(principal_payment)
-        interest_list.append(interest_payment)
-        net_profit_list.append(net_profit)
-        dscr_year_list.append(dscr)
-        cumulative_cash_list.append(running_cash)
-
-        if dscr > 0:
-            dscr_list.append(dscr)
+    # DSCR tracking (only years with positive coverage)
+    positive_dscr = dscr > 0
 
     total_lifetime_cost = total_capex + lifetime_opex
     if lifetime_production_mwh > 0:
@@ -175,34 +565,34 @@ def run_financial_model(inputs: ProjectInputs):
     # For ROE_years, approximate using same project payback for now (can refine later)
     roe_years = project_payback_year
 
-    avg_dscr = sum(dscr_list) / len(dscr_list) if dscr_list else 0.0
+    avg_dscr = float(dscr[positive_dscr].mean()) if positive_dscr.any() else 0.0
 
     yearly_breakdown = {
         "years": years,
-        "generation_mwh": [round(v, 2) for v in gen_mwh_list],
-        "revenue": [round(v, 2) for v in revenue_list],
-        "opex": [round(v, 2) for v in opex_list],
-        "debt_service": [round(v, 2) for v in debt_service_list],
-        "principal_payment": [round(v, 2) for v in principal_list],
-        "interest_payment": [round(v, 2) for v in interest_list],
-        "net_profit": [round(v, 2) for v in net_profit_list],
-        "dscr": [round(v, 3) for v in dscr_year_list],
-        "cumulative_cash": [round(v, 2) for v in cumulative_cash_list],
+        "generation_mwh": np.round(gen_mwh, 2),
+        "revenue": np.round(revenue, 2),
+        "opex": np.round(opex, 2),
+        "debt_service": np.round(debt_service, 2),
+        "principal_payment": np.round(principal, 2),
+        "interest_payment": np.round(interest, 2),
+        "net_profit": np.round(net_profit, 2),
+        "dscr": np.round(dscr, 3),
+        "cumulative_cash": np.round(cumulative_cash, 2),
     }
 
     return {
-        "hard_costs": round(inputs.hard_costs, 2),
-        "soft_costs": round(inputs.soft_costs, 2),
-        "capacity_solar_mw": round(inputs.capacity_solar_mw, 3),
-        "capacity_hydro_mw": round(inputs.capacity_hydro_mw, 3),
-        "capacity_diesel_mw": round(inputs.capacity_diesel_mw, 3),
-        "capacity_bess_mwh": round(inputs.capacity_bess_mwh, 3),
-        "tariff_php_per_kwh": round(inputs.tariff_php_per_kwh, 4),
-        "annual_opex": round(inputs.annual_opex, 2),
-        "tax_rate": round(inputs.tax_rate, 4),
-        "interest_rate": round(inputs.interest_rate, 4),
-        "debt_share": round(inputs.debt_share, 4),
-        "project_duration_years": inputs.project_duration_years,
+        "hard_costs": round(hard_costs, 2),
+        "soft_costs": round(soft_costs, 2),
+        "capacity_solar_mw": round(capacity_solar_mw, 3),
+        "capacity_hydro_mw": round(capacity_hydro_mw, 3),
+        "capacity_diesel_mw": round(capacity_diesel_mw, 3),
+        "capacity_bess_mwh": round(capacity_bess_mwh, 3),
+        "tariff_php_per_kwh": round(tariff_php_per_kwh, 4),
+        "annual_opex": round(annual_opex, 2),
+        "tax_rate": round(tax_rate, 4),
+        "interest_rate": round(interest_rate, 4),
+        "debt_share": round(debt_share, 4),
+        "project_duration_years": project_duration_years,
         "total_capex": round(total_capex, 2),
         "total_equity": round(total_equity, 2),
         "annual_revenue": round(annual_revenue_year1, 2),
@@ -220,3 +610,140 @@ def run_financial_model(inputs: ProjectInputs):
         "avg_dscr": round(avg_dscr, 2),
         "yearly_breakdown": yearly_breakdown,
     }
+
+
+_BATCH_CHUNK_SIZE = 4096  # scenarios per streamed NDJSON line
+
+
+def _batch_column(values, size, dtype):
+    """Contiguous input column for the batch kernel; length-1 lists broadcast."""
+    column = np.empty(size, dtype=dtype)
+    column[:] = values
+    return column
+
+
+@app.post(
+    "/calculate-model/batch",
+    response_model=None,
+    response_class=StreamingResponse,
+)
+def run_financial_model_batch(inputs: BatchInputs):
+    fields = [
+        inputs.hard_costs,
+        inputs.soft_costs,
+        inputs.capacity_solar_mw,
+        inputs.capacity_hydro_mw,
+        inputs.capacity_diesel_mw,
+        inputs.tariff_php_per_kwh,
+        inputs.annual_opex,
+        inputs.tax_rate,
+        inputs.interest_rate,
+        inputs.debt_share,
+        inputs.project_duration_years,
+    ]
+    try:
+        (size,) = np.broadcast_shapes(*((len(values),) for values in fields))
+    except ValueError:
+        raise HTTPException(
+            status_code=422,
+            detail="Batch inputs must all have the same length (or length 1)",
+        )
+    (
+        hard_costs,
+        soft_costs,
+        capacity_solar_mw,
+        capacity_hydro_mw,
+        capacity_diesel_mw,
+        tariff_php_per_kwh,
+        annual_opex,
+        tax_rate,
+        interest_rate,
+        debt_share,
+    ) = (_batch_column(values, size, np.float64) for values in fields[:-1])
+    project_duration_years = _batch_column(fields[-1], size, np.int64)
+
+    total_yr1_production_mwh = sum(
+        _yr1_production_mwh(capacity_solar_mw, capacity_hydro_mw, capacity_diesel_mw)
+    )
+    total_capex = hard_costs + soft_costs
+    total_debt = total_capex * debt_share
+
+    # Stream one NDJSON line of columnar results per chunk of scenarios, so
+    # the first rows go out while later chunks are still being computed
+    return StreamingResponse(
+        _batch_chunks(
+            project_duration_years,
+            total_yr1_production_mwh,
+            tariff_php_per_kwh,
+            annual_opex,
+            tax_rate,
+            total_capex,
+            total_debt,
+            interest_rate,
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
+def _batch_chunks(
+    years,
+    yr1_production_mwh,
+    tariff_php_per_kwh,
+    annual_opex,
+    tax_rate,
+    total_capex,
+    total_debt,
+    interest_rate,
+):
+    """Run the batch kernel chunk by chunk, yielding one encoded line each."""
+    for start in range(0, years.shape[0], _BATCH_CHUNK_SIZE):
+        chunk = slice(start, start + _BATCH_CHUNK_SIZE)
+        annual_revenue, annual_net_profit, lcoe, avg_dscr, project_payback_year = _project_batch(
+            years[chunk],
+            yr1_production_mwh[chunk],
+            tariff_php_per_kwh[chunk],
+            annual_opex[chunk],
+            tax_rate[chunk],
+            total_capex[chunk],
+            total_debt[chunk],
+            interest_rate[chunk],
+        )
+        yield orjson.dumps(
+            {
+                "total_capex": np.round(total_capex[chunk], 2),
+                "total_production_mwh": np.round(yr1_production_mwh[chunk], 2),
+                "annual_revenue": np.round(annual_revenue, 2),
+                "annual_net_profit": np.round(annual_net_profit, 2),
+                "LCOE_kwh": np.round(lcoe / 1000, 4),  # convert to per kWh
+                "project_payback_year": project_payback_year,
+                "avg_dscr": np.round(avg_dscr, 2),
+            },
+            option=_ORJSON_OPTIONS,
+        ) + b"\n"
+
+
+if __name__ == "__main__":
+    # Production entrypoint: `python main.py` from the backend directory.
+    # One worker process per core by default (override with WEB_CONCURRENCY);
+    # uvloop is picked up automatically where installed, httptools parses HTTP.
+    import uvicorn
+
+    cpu_count = os.cpu_count() or 1
+    workers = max(int(os.environ.get("WEB_CONCURRENCY", cpu_count)), 1)
+    # Each worker's parallel batch kernel starts its own Numba thread pool;
+    # split the cores between workers (read by the spawned workers at import)
+    # instead of running workers * cores threads. With the default of one
+    # worker per core this means one Numba thread each: a single batch sweep
+    # then runs on one core, and the cores are shared across concurrent
+    # requests instead. Deployments serving mostly large sweeps should lower
+    # WEB_CONCURRENCY (or set NUMBA_NUM_THREADS) to give each sweep more cores.
+    os.environ.setdefault("NUMBA_NUM_THREADS", str(max(cpu_count // workers, 1)))
+
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", 8000)),
+        workers=workers,
+        http="httptools",
+        access_log=False,
+    )
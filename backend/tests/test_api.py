@@ -0,0 +1,155 @@
+"""Request handling of the /calculate-model endpoints."""
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+client = TestClient(main.app)
+
+PAYLOAD = dict(
+    hard_costs=1000000,
+    soft_costs=500000,
+    capacity_solar_mw=10,
+    tariff_php_per_kwh=5.25,
+    annual_opex=2000000,
+    tax_rate=0.25,
+    interest_rate=0.08,
+    debt_share=0.7,
+    project_duration_years=25,
+)
+
+
+def test_matching_etag_gets_304():
+    etag = client.post("/calculate-model", json=PAYLOAD).headers["etag"]
+    response = client.post("/calculate-model", json=PAYLOAD, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_etag_distinguishes_inputs_with_equal_hashes():
+    # hash(-1.0) == hash(-2.0) in CPython
+    first = client.post("/calculate-model", json=dict(PAYLOAD, tax_rate=-1.0))
+    second = client.post(
+        "/calculate-model",
+        json=dict(PAYLOAD, tax_rate=-2.0),
+        headers={"If-None-Match": first.headers["etag"]},
+    )
+    assert second.status_code == 200
+    assert second.headers["etag"] != first.headers["etag"]
+    assert second.json()["annual_net_profit"] != first.json()["annual_net_profit"]
+
+
+def test_project_duration_is_bounded():
+    for years in (-1, main.MAX_PROJECT_DURATION_YEARS + 1, 2**62):
+        response = client.post("/calculate-model", json=dict(PAYLOAD, project_duration_years=years))
+        assert response.status_code == 422
+
+    batch = {field: [value] for field, value in PAYLOAD.items() if field != "capacity_bess_mwh"}
+    batch["project_duration_years"] = [main.MAX_PROJECT_DURATION_YEARS, 2**62]
+    response = client.post("/calculate-model/batch", json=batch)
+    assert response.status_code == 422
+
+
+def test_cors_allows_conditional_requests():
+    response = client.options(
+        "/calculate-model",
+        headers={
+            "Origin": "http://localhost:5173",
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "content-type, if-none-match",
+        },
+    )
+    assert response.status_code == 200
+    response = client.post("/calculate-model", json=PAYLOAD, headers={"Origin": "http://localhost:5173"})
+    assert "etag" in response.headers["access-control-expose-headers"].lower()
+    assert response.headers["access-control-allow-origin"] == "*"
+    assert "access-control-allow-credentials" not in response.headers
+
+
+def test_only_batch_responses_are_gzipped():
+    response = client.post(
+        "/calculate-model", json=PAYLOAD, headers={"Accept-Encoding": "gzip"}
+    )
+    assert "content-encoding" not in response.headers
+
+    batch = {field: [value] for field, value in PAYLOAD.items() if field != "capacity_bess_mwh"}
+    batch["tariff_php_per_kwh"] = [5.0 + i / 100 for i in range(200)]
+    response = client.post(
+        "/calculate-model/batch", json=batch, headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.headers["content-encoding"] == "gzip"
+
+
+def test_if_none_match_lists_and_wildcard():
+    etag = client.post("/calculate-model", json=PAYLOAD).headers["etag"]
+    for header in (f'"other", {etag}', etag.removeprefix("W/"), "*"):
+        response = client.post("/calculate-model", json=PAYLOAD, headers={"If-None-Match": header})
+        assert response.status_code == 304, header
+    response = client.post("/calculate-model", json=PAYLOAD, headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
+
+
+def test_batch_stream_matches_single_scenarios():
+    size = main._BATCH_CHUNK_SIZE + 100
+    batch = {field: [value] for field, value in PAYLOAD.items() if field != "capacity_bess_mwh"}
+    batch["tariff_php_per_kwh"] = [3.0 + (i % 97) * 0.07 for i in range(size)]
+    batch["project_duration_years"] = [1 + i % 40 for i in range(size)]
+
+    response = client.post("/calculate-model/batch", json=batch)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert len(lines) == 2  # one line per chunk of _BATCH_CHUNK_SIZE scenarios
+
+    chunks = [orjson.loads(line) for line in lines]
+    assert [len(chunk["total_capex"]) for chunk in chunks] == [main._BATCH_CHUNK_SIZE, 100]
+    merged = {key: sum((chunk[key] for chunk in chunks), []) for key in chunks[0]}
+
+    for i in (0, 1, 96, main._BATCH_CHUNK_SIZE - 1, main._BATCH_CHUNK_SIZE, size - 1):
+        single = client.post(
+            "/calculate-model",
+            json=dict(
+                PAYLOAD,
+                capacity_bess_mwh=0,
+                tariff_php_per_kwh=batch["tariff_php_per_kwh"][i],
+                project_duration_years=batch["project_duration_years"][i],
+            ),
+        ).json()
+        for key, values in merged.items():
+            assert values[i] == pytest.approx(single[key], rel=1e-9, abs=0.011), (i, key)
+
+
+def test_batch_with_no_scenarios_streams_nothing():
+    batch = {field: [] for field in PAYLOAD if field != "capacity_bess_mwh"}
+    response = client.post("/calculate-model/batch", json=batch)
+    assert response.status_code == 200
+    assert response.content == b""
+
+
+def test_lax_decoding_matches_pydantic():
+    response = client.post(
+        "/calculate-model",
+        json=dict(PAYLOAD, project_duration_years=25.0, tariff_php_per_kwh="5.25"),
+    )
+    assert response.status_code == 200
+    assert response.json() == client.post("/calculate-model", json=PAYLOAD).json()
+
+
+def test_validation_errors_keep_fastapi_shape():
+    cases = [
+        (dict(PAYLOAD, unknown=1), "extra_forbidden", ["body", "unknown"]),
+        ({k: v for k, v in PAYLOAD.items() if k != "tax_rate"}, "missing", ["body", "tax_rate"]),
+        (dict(PAYLOAD, hard_costs="abc"), "value_error", ["body", "hard_costs"]),
+        (dict(PAYLOAD, project_duration_years=25.5), "value_error", ["body", "project_duration_years"]),
+    ]
+    for payload, error_type, loc in cases:
+        response = client.post("/calculate-model", json=payload)
+        assert response.status_code == 422
+        (error,) = response.json()["detail"]
+        assert (error["type"], error["loc"]) == (error_type, loc)
+
+    response = client.post(
+        "/calculate-model", content=b"{bad", headers={"Content-Type": "application/json"}
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "json_invalid"
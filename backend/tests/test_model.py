@@ -0,0 +1,139 @@
+"""Differential tests of the compiled kernels against the original per-year loop."""
+import numpy as np
+import pytest
+
+import main
+
+
+def _reference_projection(
+    years,
+    yr1_production_mwh,
+    tariff_php_per_kwh,
+    annual_opex,
+    tax_rate,
+    total_capex,
+    total_debt,
+    interest_rate,
+    annual_debt_service,
+):
+    """The original pure-Python yearly loop, carrying the debt balance forward."""
+    remaining_debt = total_debt
+    running_cash = -total_capex
+    project_payback_year = 999
+    rows = []
+    for year in range(1, years + 1):
+        current_production_mwh = yr1_production_mwh * (1 - main.DEGRADATION_RATE) ** (year - 1)
+        current_revenue = current_production_mwh * 1000 * tariff_php_per_kwh
+        current_opex = annual_opex * (1 + main.INFLATION_RATE) ** (year - 1)
+
+        if remaining_debt > 0 and annual_debt_service > 0:
+            interest_payment = remaining_debt * interest_rate
+            principal_payment = max(annual_debt_service - interest_payment, 0.0)
+            if principal_payment > remaining_debt:
+                principal_payment = remaining_debt
+            debt_service = interest_payment + principal_payment
+            remaining_debt = max(remaining_debt - principal_payment, 0.0)
+        else:
+            interest_payment = 0.0
+            principal_payment = 0.0
+            debt_service = 0.0
+
+        taxable_income = current_revenue - current_opex - interest_payment
+        tax = taxable_income * tax_rate if taxable_income > 0 else 0.0
+        net_profit = taxable_income - tax
+
+        cfads = current_revenue - current_opex
+        dscr = cfads / annual_debt_service if annual_debt_service > 0 else 0.0
+
+        running_cash += current_revenue - current_opex - tax - debt_service
+        if running_cash > 0 and project_payback_year == 999:
+            project_payback_year = year
+
+        rows.append(
+            (
+                current_production_mwh,
+                current_revenue,
+                current_opex,
+                debt_service,
+                principal_payment,
+                interest_payment,
+                net_profit,
+                dscr,
+                running_cash,
+            )
+        )
+    return np.array(rows).reshape(-1, 9).T, project_payback_year
+
+
+# (years, interest_rate, debt_share); long high-rate loans are where a
+# closed-form balance loses all precision
+SCENARIOS = [
+    (25, 0.08, 0.7),
+    (30, 0.0, 0.5),
+    (40, 0.001, 1.0),
+    (1, 0.12, 1.0),
+    (0, 0.08, 0.7),
+    (100, 0.286, 1.0),
+    (100, 0.295, 1.0),
+    (100, 0.5, 1.0),
+]
+
+
+def _scenario_args(years, interest_rate, debt_share):
+    total_capex = 2.5e9
+    total_debt = total_capex * debt_share
+    return (
+        years,
+        40 * main.SOLAR_YIELD,  # 40 MW of solar
+        5.25,
+        2.0e7,
+        0.25,
+        total_capex,
+        total_debt,
+        interest_rate,
+        main._annual_debt_service(total_debt, interest_rate, years),
+    )
+
+
+@pytest.mark.parametrize("years,interest_rate,debt_share", SCENARIOS)
+def test_project_matches_reference_loop(years, interest_rate, debt_share):
+    args = _scenario_args(years, interest_rate, debt_share)
+    *series, payback_year = main._project(*args)
+    expected, expected_payback_year = _reference_projection(*args)
+
+    np.testing.assert_allclose(np.array(series), expected, rtol=1e-9, atol=1e-3)
+    assert payback_year == expected_payback_year
+
+
+@pytest.mark.parametrize("years,interest_rate,debt_share", SCENARIOS)
+def test_project_batch_matches_reference_loop(years, interest_rate, debt_share):
+    args = _scenario_args(years, interest_rate, debt_share)
+    expected, expected_payback_year = _reference_projection(*args)
+    (
+        gen_mwh,
+        revenue,
+        opex,
+        _,
+        _,
+        _,
+        net_profit,
+        dscr,
+        _,
+    ) = expected
+
+    (
+        annual_revenue,
+        annual_net_profit,
+        lcoe,
+        avg_dscr,
+        project_payback_year,
+    ) = main._project_batch(
+        np.array([years]), *(np.array([value], dtype=np.float64) for value in args[1:-1])
+    )
+
+    assert project_payback_year[0] == expected_payback_year
+    if years > 0:
+        np.testing.assert_allclose(annual_revenue[0], revenue[0], rtol=1e-9)
+        np.testing.assert_allclose(annual_net_profit[0], net_profit[0], rtol=1e-9)
+        np.testing.assert_allclose(lcoe[0], (args[5] + opex.sum()) / gen_mwh.sum(), rtol=1e-9)
+        np.testing.assert_allclose(avg_dscr[0], dscr[dscr > 0].mean(), rtol=1e-9)